@@ -0,0 +1,673 @@
+"""Shared engine for the Science Community chat apps.
+
+Both Streamlit entrypoints (sc_app for OpenAI, sc_bedrock_app for AWS
+Bedrock) drive the same document loading, indexing, caching and chat-engine
+code here; only the Provider differs. Provider SDKs are imported lazily so
+each app only needs its own provider's packages installed.
+"""
+
+import streamlit as st
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from enum import Enum
+from typing import Dict, Any
+
+import chromadb
+
+from llama_index.core import (
+    SimpleDirectoryReader,
+    VectorStoreIndex,
+    Settings,
+    StorageContext,
+)
+from llama_index.vector_stores.chroma import ChromaVectorStore
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.ingestion import IngestionCache, IngestionPipeline
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.memory import ChatSummaryMemoryBuffer
+
+# On-disk storage (Chroma collections, ingestion cache) is shared by both
+# apps; collections are keyed per provider via the corpus fingerprint
+STORAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage")
+
+# How many recent turns to render as chat widgets per rerun
+HISTORY_WINDOW = 20
+
+# Chunking tuned for the short biography corpus: smaller chunks and less
+# overlap than the defaults (1024/200) mean fewer nodes to embed and store
+CHUNK_SIZE = 512
+CHUNK_OVERLAP = 50
+
+class Provider(str, Enum):
+    """Model provider backing the LLM and embedding model"""
+    OPENAI = "openai"
+    BEDROCK = "bedrock"
+
+class Int8Embedding(BaseEmbedding):
+    """Snap vectors from an inner embedding model onto an int8 grid.
+
+    Per-vector scaling cancels under cosine similarity, so quantized
+    document and query vectors stay directly comparable while the store
+    only has to represent 255 distinct values per dimension.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+
+    def __init__(self, inner: BaseEmbedding, **kwargs):
+        super().__init__(
+            model_name=f"int8-{inner.model_name}",
+            embed_batch_size=inner.embed_batch_size,
+            **kwargs,
+        )
+        self._inner = inner
+
+    @staticmethod
+    def _quantize(embedding):
+        scale = max(abs(v) for v in embedding) or 1.0
+        return [float(round(v * 127.0 / scale)) for v in embedding]
+
+    def _get_query_embedding(self, query):
+        return self._quantize(self._inner._get_query_embedding(query))
+
+    async def _aget_query_embedding(self, query):
+        return self._quantize(await self._inner._aget_query_embedding(query))
+
+    def _get_text_embedding(self, text):
+        return self._quantize(self._inner._get_text_embedding(text))
+
+    def _get_text_embeddings(self, texts):
+        return [self._quantize(e) for e in self._inner._get_text_embeddings(texts)]
+
+@st.cache_resource
+def get_llm(provider: Provider, temperature: float = 0.3):
+    """Create (and cache) the provider's LLM for the given temperature"""
+    if provider is Provider.OPENAI:
+        from llama_index.llms.openai import OpenAI
+
+        return OpenAI(model="gpt-4o", temperature=temperature)
+
+    from llama_index.llms.bedrock_converse import BedrockConverse
+
+    return BedrockConverse(
+        model="amazon.nova-pro-v1:0",
+        temperature=temperature,
+        max_tokens=3000
+    )
+
+@st.cache_resource
+def get_embed_model(provider: Provider):
+    """Create (and cache) the provider's embedding model so HTTP clients and
+    the boto3 credential chain are initialized once, not per rebuild"""
+    if provider is Provider.OPENAI:
+        from llama_index.embeddings.openai import OpenAIEmbedding
+
+        # Batch chunks so N embedding calls collapse into ceil(N/100) requests
+        return Int8Embedding(OpenAIEmbedding(embed_batch_size=100, num_workers=4))
+
+    from llama_index.embeddings.bedrock import BedrockEmbedding
+
+    # Titan v2 accepts one text per InvokeModel call, so the batch size only
+    # sizes the client-side loop; keep it modest
+    return Int8Embedding(BedrockEmbedding(
+        model_name="amazon.titan-embed-text-v2:0",
+        embed_batch_size=10
+    ))
+
+@st.cache_resource
+def get_tokenizer_fn(provider: Provider):
+    """Token counter used to budget chat memory for the provider's models"""
+    if provider is Provider.OPENAI:
+        # Exact gpt-4o counts via tiktoken (an OpenAI-only dependency)
+        import tiktoken
+
+        return tiktoken.encoding_for_model("gpt-4o").encode
+
+    # Nova has no public tokenizer; budget at roughly 4 characters/token
+    return lambda text: [0] * (len(text) // 4 + 1)
+
+@st.cache_resource
+def load_documents(data_path: str):
+    """Load documents from the specified data directory"""
+    try:
+        if not os.path.exists(data_path):
+            st.error(f"Data path does not exist: {data_path}")
+            return None
+        reader = SimpleDirectoryReader(data_path)
+        try:
+            # Parse files in a process pool; falls back if the worker pool
+            # cannot be spawned in the current environment
+            documents = reader.load_data(num_workers=min(8, os.cpu_count() or 1))
+        except Exception:
+            documents = reader.load_data()
+        if not documents:
+            st.error(f"No documents found in: {data_path}")
+            return None
+        return documents
+    except Exception as e:
+        st.error(f"Error loading documents: {e}")
+        return None
+
+@st.cache_data(ttl=30)
+def list_supported_files(data_path: str, dir_mtime: float):
+    """List supported documents; dir_mtime invalidates the cache on changes"""
+    return sorted(
+        f for f in os.listdir(data_path)
+        if f.endswith(('.txt', '.md', '.pdf', '.docx'))
+    )
+
+@st.cache_data
+def compute_file_stats(file_names):
+    """Histogram of upload extensions, memoized on the upload set"""
+    file_types = {}
+    for name in file_names:
+        ext = name.rsplit('.', 1)[-1].lower()
+        file_types[ext] = file_types.get(ext, 0) + 1
+    return file_types
+
+@st.cache_data
+def format_file_listing(file_entries):
+    """Pre-render the selected-files lines, memoized on the upload set"""
+    return [
+        f"{i:2d}. 📄 {name} ({size / 1024:.1f} KB)"
+        for i, (name, size) in enumerate(file_entries, 1)
+    ]
+
+def corpus_fingerprint(provider: Provider, documents):
+    """Hash the provider, chunking parameters and document file paths and
+    modification times to key the persisted index"""
+    hasher = hashlib.sha256(
+        f"{provider.value}:chunk:{CHUNK_SIZE}:{CHUNK_OVERLAP}:int8-cosine".encode()
+    )
+    for file_path in sorted({doc.metadata.get("file_path", "") for doc in documents}):
+        mtime = os.path.getmtime(file_path) if os.path.isfile(file_path) else 0.0
+        hasher.update(f"{file_path}:{mtime}".encode())
+    return hasher.hexdigest()
+
+@st.cache_resource
+def build_index(provider: Provider, documents):
+    """Build the vector index; embeddings are temperature-independent"""
+    if documents is None:
+        return None
+
+    # Only the embedding model matters for indexing
+    Settings.embed_model = get_embed_model(provider)
+
+    # Vectors live in a persistent Chroma collection keyed by the corpus
+    # fingerprint, so restarts reconnect instead of re-embedding
+    chroma_path = os.path.join(STORAGE_DIR, "chroma_db")
+    client = chromadb.PersistentClient(path=chroma_path)
+    prefix = f"sc_docs_{provider.value}_"
+    collection_name = f"{prefix}{corpus_fingerprint(provider, documents)[:16]}"
+
+    # Drop this provider's stale collections so file edits, upload changes
+    # and rebuilds do not accumulate orphaned embeddings on disk
+    for existing in client.list_collections():
+        name = getattr(existing, "name", existing)
+        if name.startswith(prefix) and name != collection_name:
+            client.delete_collection(name)
+
+    # Cosine space is required for the int8-quantized vectors: per-vector
+    # quantization scales cancel under cosine but would skew L2 (Chroma's
+    # default) by each document's norm
+    collection = client.get_or_create_collection(
+        collection_name,
+        metadata={"hnsw:space": "cosine"},
+    )
+    vector_store = ChromaVectorStore(chroma_collection=collection)
+    if collection.count() > 0:
+        return VectorStoreIndex.from_vector_store(vector_store)
+
+    # Embed through a content-addressed cache so editing one file only
+    # re-embeds its changed chunks, not the whole corpus
+    cache_path = os.path.join(STORAGE_DIR, f"ingest_cache_{provider.value}")
+    if os.path.exists(cache_path):
+        ingest_cache = IngestionCache.from_persist_path(cache_path)
+    else:
+        ingest_cache = IngestionCache()
+    pipeline = IngestionPipeline(
+        transformations=[
+            SentenceSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP),
+            Settings.embed_model,
+        ],
+        cache=ingest_cache,
+    )
+    nodes = pipeline.run(documents=documents)
+    ingest_cache.persist(cache_path)
+
+    # Create the index on top of the Chroma-backed storage context
+    storage_context = StorageContext.from_defaults(vector_store=vector_store)
+    index = VectorStoreIndex(nodes, storage_context=storage_context)
+    return index
+
+def create_chat_engine(index, provider: Provider, engine_type: str,
+                       config: Dict[str, Any]):
+    """Create chat engine based on type and configuration"""
+    if index is None:
+        return None
+
+    # One cached LLM per temperature, shared by every engine mode
+    llm = get_llm(provider, config.get("temperature", 0.3))
+    Settings.llm = llm
+
+    if engine_type == "condense_question":
+        # Pack retrieved nodes into one synthesis call instead of refining
+        # once per node
+        return index.as_chat_engine(
+            "condense_question",
+            llm=llm,
+            similarity_top_k=config.get("similarity_top_k", 3),
+            response_mode="compact",
+            verbose=True
+        )
+
+    elif engine_type == "context":
+        # Summarize older turns and keep the tail verbatim instead of
+        # shipping the raw rolling history every turn
+        memory = ChatSummaryMemoryBuffer.from_defaults(
+            llm=llm,
+            token_limit=config.get("token_limit", 3900),
+            tokenizer_fn=get_tokenizer_fn(provider)
+        )
+        return index.as_chat_engine(
+            chat_mode="context",
+            memory=memory,
+            llm=llm,
+            similarity_top_k=config.get("similarity_top_k", 3),
+            system_prompt=config.get("system_prompt",
+                "You are familiar with biographies of Albert and Marie, as well as their professional and social friendships and relationships.")
+        )
+
+    elif engine_type == "condense_plus_context":
+        # Summarize older turns and keep the tail verbatim instead of
+        # shipping the raw rolling history every turn
+        memory = ChatSummaryMemoryBuffer.from_defaults(
+            llm=llm,
+            token_limit=config.get("token_limit", 3900),
+            tokenizer_fn=get_tokenizer_fn(provider)
+        )
+        return index.as_chat_engine(
+            chat_mode="condense_plus_context",
+            memory=memory,
+            llm=llm,
+            similarity_top_k=config.get("similarity_top_k", 3),
+            context_prompt=config.get("context_prompt",
+                "You are familiar with biographies of Albert and Marie, as well as their professional and social friendships and relationships."),
+            verbose=True
+        )
+
+    else:
+        return index.as_chat_engine(
+            llm=llm,
+            similarity_top_k=config.get("similarity_top_k", 3),
+            response_mode="compact"
+        )
+
+def astream_chat_sync(chat_engine, prompt):
+    """Run astream_chat on a private event loop and bridge its async token
+    generator to the sync iterator st.write_stream expects. The async path
+    overlaps query embedding, retrieval and the condense/answer LLM calls."""
+    loop = asyncio.new_event_loop()
+    try:
+        streaming_response = loop.run_until_complete(chat_engine.astream_chat(prompt))
+    except BaseException:
+        loop.close()
+        raise
+
+    def token_gen():
+        try:
+            agen = streaming_response.async_response_gen()
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
+
+    return token_gen()
+
+def _select_data_path(default_data_path: str):
+    """Sidebar data-source picker: default folder, custom path or uploads"""
+    # Directory selection method
+    path_method = st.radio(
+        "Choose data source method:",
+        ["Use default data folder", "Enter custom path", "Upload files"],
+        help="Select how you want to provide documents"
+    )
+
+    if path_method == "Use default data folder":
+        data_path = default_data_path
+        st.info(f"Using default path: `{data_path}`")
+
+    elif path_method == "Enter custom path":
+        data_path = st.text_input(
+            "Data Directory Path",
+            value=default_data_path,
+            help="Enter the full path to directory containing documents",
+            placeholder="/path/to/your/documents"
+        )
+
+        # Add browse button hint
+        st.info("💡 **Tip**: You can copy the path from your file manager")
+
+        # Show some common paths as examples
+        with st.expander("📂 Example paths"):
+            st.text("macOS: /Users/username/Documents/my_docs")
+            st.text("Windows: C:\\Users\\username\\Documents\\my_docs")
+            st.text("Linux: /home/username/documents/my_docs")
+
+    else:  # Upload files
+        st.info("📂 **Visual File Selection**")
+
+        # Create columns for better layout
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            st.markdown("### 📁 Select Your Documents")
+            st.markdown("*Drag and drop files or click to browse*")
+
+            uploaded_files = st.file_uploader(
+                "📎 Choose Document Files",
+                accept_multiple_files=True,
+                type=['txt', 'md', 'pdf', 'docx'],
+                help="Select all files from your directory at once",
+                label_visibility="collapsed"
+            )
+
+        with col2:
+            st.markdown("### 📊 File Stats")
+            if uploaded_files:
+                st.metric("Files Selected", len(uploaded_files))
+
+                # Show file types (recomputed only when uploads change)
+                file_types = compute_file_stats(
+                    tuple(f.name for f in uploaded_files)
+                )
+
+                st.markdown("**File Types:**")
+                for ext, count in file_types.items():
+                    st.text(f"📄 {ext.upper()}: {count}")
+            else:
+                st.metric("Files Selected", 0)
+
+        # Visual feedback section
+        if uploaded_files:
+            st.markdown("---")
+            st.markdown("### 📋 Selected Files")
+
+            # Create expandable file list
+            with st.expander(f"📁 View {len(uploaded_files)} selected files", expanded=len(uploaded_files) <= 5):
+                for line in format_file_listing(
+                    tuple((f.name, f.size) for f in uploaded_files)
+                ):
+                    st.text(line)
+
+            # Create temp directory for uploaded files
+            if 'temp_dir' not in st.session_state:
+                st.session_state.temp_dir = tempfile.mkdtemp()
+
+            temp_dir = st.session_state.temp_dir
+
+            # Reruns fire on every widget interaction; only rewrite the
+            # temp directory when the upload set actually changes
+            uploads_sig = hashlib.sha256(
+                "".join(f"{f.name}:{f.size}" for f in uploaded_files).encode()
+            ).hexdigest()
+            if uploads_sig != st.session_state.get("uploads_sig"):
+                # Clear previous files
+                try:
+                    for file in os.listdir(temp_dir):
+                        file_path = os.path.join(temp_dir, file)
+                        if os.path.isfile(file_path):
+                            os.remove(file_path)
+                except Exception:
+                    pass  # Ignore errors when clearing temp files
+
+                # Save new files, streaming each upload instead of
+                # materializing the whole buffer in memory first
+                for uploaded_file in uploaded_files:
+                    uploaded_file.seek(0)
+                    with open(os.path.join(temp_dir, uploaded_file.name), "wb") as f:
+                        shutil.copyfileobj(uploaded_file, f)
+
+                st.session_state.uploads_sig = uploads_sig
+
+            data_path = temp_dir
+            st.success(f"✅ Ready to process {len(uploaded_files)} documents!")
+
+            # Show processing info
+            st.info("💡 **Tip**: These files will be processed into searchable chunks for the chat engine.")
+
+        else:
+            # Show upload instructions
+            st.markdown("---")
+            st.markdown("### 📝 How to Upload")
+            st.markdown("""
+            **Option 1 - Drag & Drop:**
+            - Drag files from your file manager directly onto the upload area above
+
+            **Option 2 - Browse:**
+            - Click the upload area to open file browser
+            - Select multiple files using Ctrl+Click (Windows/Linux) or Cmd+Click (Mac)
+            - Choose files from the same directory for best results
+
+            **Supported Formats:**
+            - 📄 Text files (.txt)
+            - 📝 Markdown (.md)
+            - 📖 PDF documents (.pdf)
+            - 📃 Word documents (.docx)
+            """)
+
+            # Fallback to default if no files uploaded
+            data_path = default_data_path
+            st.warning("⚠️ No files selected. Using default sample documents.")
+
+    return data_path
+
+def run_app(provider: Provider, default_data_path: str,
+            allow_custom_source: bool = False):
+    """Run the chat UI for the given provider.
+
+    allow_custom_source adds the custom-path/upload data-source picker;
+    otherwise documents always come from default_data_path.
+    """
+    # Initialize session state
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+    # Sidebar for configuration
+    with st.sidebar:
+        st.header("⚙️ Configuration")
+
+        if allow_custom_source:
+            st.subheader("📁 Data Source")
+            data_path = _select_data_path(default_data_path)
+            st.divider()
+        else:
+            data_path = default_data_path
+
+        # Chat engine selection
+        engine_type = st.selectbox(
+            "Chat Engine",
+            ["condense_question", "context", "condense_plus_context"],
+            help="""
+            • **condense_question**: Condenses conversation history into standalone questions
+            • **context**: Uses explicit memory management with retrieved context
+            • **condense_plus_context**: Hybrid approach combining both strategies
+            """
+        )
+
+        st.divider()
+
+        # Common settings
+        st.subheader("🌡️ Common Settings")
+        temperature = st.slider(
+            "Temperature",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.3,
+            step=0.1,
+            help="Controls randomness in responses. Lower = more focused, Higher = more creative"
+        )
+
+        # Engine-specific settings
+        st.subheader("🔧 Engine-Specific Settings")
+
+        config = {"temperature": temperature}
+
+        similarity_top_k = st.number_input(
+            "Retrieved Chunks (top k)",
+            min_value=1,
+            max_value=10,
+            value=3,
+            step=1,
+            help="How many document chunks to retrieve per question"
+        )
+        config["similarity_top_k"] = similarity_top_k
+
+        if engine_type in ["context", "condense_plus_context"]:
+            token_limit = st.number_input(
+                "Memory Token Limit",
+                min_value=1000,
+                max_value=8000,
+                value=3900,
+                step=100,
+                help="Maximum tokens to keep in conversation memory"
+            )
+            config["token_limit"] = token_limit
+
+            if engine_type == "context":
+                system_prompt = st.text_area(
+                    "System Prompt",
+                    value="You are familiar with biographies of Albert and Marie, as well as their professional and social friendships and relationships.",
+                    height=100,
+                    help="Instructions for the AI about its role and knowledge"
+                )
+                config["system_prompt"] = system_prompt
+
+            elif engine_type == "condense_plus_context":
+                context_prompt = st.text_area(
+                    "Context Prompt",
+                    value="You are familiar with biographies of Albert and Marie, as well as their professional and social friendships and relationships.",
+                    height=100,
+                    help="Instructions for how to use the retrieved context"
+                )
+                config["context_prompt"] = context_prompt
+
+        # Data info
+        st.divider()
+        st.subheader("📚 Current Data Path")
+        st.info(f"Documents loaded from: `{data_path}`")
+
+        # Show available files if path exists
+        if os.path.exists(data_path):
+            try:
+                files = list_supported_files(data_path, os.path.getmtime(data_path))
+                if files:
+                    st.text("Available documents:")
+                    for file in files[:10]:  # Show first 10 files
+                        st.text(f"• {file}")
+                    if len(files) > 10:
+                        st.text(f"... and {len(files) - 10} more files")
+                else:
+                    st.warning("No supported document files found in directory")
+            except Exception as e:
+                st.error(f"Error reading directory: {e}")
+        else:
+            st.error("Directory does not exist")
+
+    # Main chat interface
+    st.header(f"💬 Chat ({engine_type.replace('_', ' ').title()})")
+
+    # Build the index once per session so UI-only interactions skip even
+    # the cache-key hashing cost; the sidebar button or a change of data
+    # source forces a rebuild
+    index_source = (provider.value, data_path, st.session_state.get("uploads_sig"))
+    if (st.sidebar.button("🔄 Rebuild Index")
+            or st.session_state.get("index_source") != index_source):
+        load_documents.clear()
+        build_index.clear()
+        st.session_state.pop("index", None)
+        st.session_state.pop("chat_engine", None)
+        st.session_state.pop("chat_engine_sig", None)
+
+    if "index" not in st.session_state:
+        with st.spinner("Loading documents and creating index..."):
+            documents = load_documents(data_path)
+            if documents:
+                st.session_state.index = build_index(provider, documents)
+                st.session_state.index_source = index_source
+
+    index = st.session_state.get("index")
+    if index is None:
+        st.error("Failed to load documents or create index")
+        return
+
+    # Keep the engine in session state so its memory accumulates
+    # across reruns; rebuilding it every rerun discards memory and
+    # sends only the latest prompt to the LLM
+    engine_sig = (provider.value, engine_type, tuple(sorted(config.items())))
+    if st.session_state.get("chat_engine_sig") != engine_sig:
+        st.session_state.chat_engine = create_chat_engine(
+            index, provider, engine_type, config
+        )
+        st.session_state.chat_engine_sig = engine_sig
+    chat_engine = st.session_state.chat_engine
+
+    # Display chat messages; keep the rendered widget count O(window) by
+    # collapsing older turns into a single expander
+    older = st.session_state.messages[:-HISTORY_WINDOW]
+    if older:
+        with st.expander(f"Previous {len(older)} messages"):
+            for message in older:
+                st.markdown(f"**{message['role']}**: {message['content']}")
+    for message in st.session_state.messages[-HISTORY_WINDOW:]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    # Chat input
+    if prompt := st.chat_input("Ask a question about the science community..."):
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+
+        # Display user message
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Generate and display assistant response
+        with st.chat_message("assistant"):
+            try:
+                try:
+                    # Render tokens as they arrive so perceived latency is
+                    # time-to-first-token rather than total generation time
+                    with st.spinner("Thinking..."):
+                        token_stream = astream_chat_sync(chat_engine, prompt)
+                    response_text = st.write_stream(token_stream)
+                except NotImplementedError:
+                    # Engine without streaming support: fall back to blocking chat
+                    with st.spinner("Thinking..."):
+                        response = chat_engine.chat(prompt)
+                    # .response is already the plain string; str() would
+                    # re-format the whole response object
+                    response_text = response.response
+                    st.markdown(response_text)
+
+                # Add assistant response to chat history
+                st.session_state.messages.append({"role": "assistant", "content": response_text})
+
+            except Exception as e:
+                error_msg = f"Error generating response: {e}"
+                st.error(error_msg)
+                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+
+    # Clear chat button
+    if st.sidebar.button("🗑️ Clear Chat History"):
+        st.session_state.messages = []
+        # Drop the cached engine so its conversation memory resets too
+        st.session_state.pop("chat_engine", None)
+        st.session_state.pop("chat_engine_sig", None)
+        st.rerun()